@@ -11,10 +11,16 @@ matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.patches import Wedge
-from scipy.signal import butter, sosfilt, sosfilt_zi
+from scipy.signal import butter, sosfilt_zi
+from scipy.fft import rfft, irfft, rfftfreq, next_fast_len
+from numba import njit
 import tkinter as tk
 import sounddevice as sd
-import queue
+import threading
+from math import log2
+from functools import lru_cache
+from collections import deque
+from time import perf_counter
 
 # ============================================
 # Guitar strings reference
@@ -30,92 +36,218 @@ STRINGS = {
 }
 
 def cents_diff(f_meas, f_target):
-    return (1200 * np.log2(f_meas / f_target)) / 10
+    return 1200 * log2(f_meas / f_target)
+
+_STR_NAMES = np.array(list(STRINGS.keys()))
+_STR_FREQS = np.array(list(STRINGS.values()), dtype=np.float64)
+_STR_LOG2 = np.log2(_STR_FREQS)
 
 def freq_to_string(freq):
-    diffs = {note: abs(freq - f) for note, f in STRINGS.items()}
-    name = min(diffs, key=diffs.get)
-    return name, STRINGS[name]
+    # Nearest string in log-frequency (musical) distance
+    if freq <= 0:
+        i = 0
+    else:
+        i = int(np.argmin(np.abs(_STR_LOG2 - np.log2(freq))))
+    return str(_STR_NAMES[i]), float(_STR_FREQS[i])
 
 # ============================================
 # Bandpass filter
 # ============================================
 
-def make_bandpass_sos(low_hz, high_hz, fs, order=5):
+# The cached designs are shared, so they are kept read-only and callers
+# get their own copy
+@lru_cache(maxsize=32)
+def _bandpass_sos(low_hz, high_hz, fs, order):
     nyq = 0.5 * fs
     low = np.clip(low_hz / nyq, 0.0001, 0.99)
     high = np.clip(high_hz / nyq, 0.0002, 0.999)
     sos = butter(order, [low, high], btype="bandpass", output="sos")
+    sos.setflags(write=False)
     return sos
 
-# ============================================
-# Gauge drawing
-# ============================================
-
-def draw_gauge(fig, diff_cents, string_name):
-    fig.clear()
-    ax = fig.add_subplot(111)
-    ax.set_xlim(-1, 1)
-    ax.set_ylim(-0.1, 1.1)
-    ax.axis("off")
-
-    base = Wedge((0, 0), 1, 0, 180, color="lightgray", ec="k")
-    ax.add_patch(base)
+@lru_cache(maxsize=32)
+def _bandpass_zi(low_hz, high_hz, fs, order):
+    zi = sosfilt_zi(_bandpass_sos(low_hz, high_hz, fs, order))
+    zi.setflags(write=False)
+    return zi
 
-    zone_ok = Wedge((0, 0), 1, 80, 100, color="lightgreen")
-    zone_low = Wedge((0, 0), 1, 100, 180, color="#ff7f7f")
-    zone_hi = Wedge((0, 0), 1, 0, 80, color="#ff7f7f")
-    for z in [zone_ok, zone_low, zone_hi]:
-        ax.add_patch(z)
-
-    lim = np.clip(diff_cents, -50, 50)
-    theta = 90 - (lim / 50) * 90
-    rad = np.deg2rad(theta)
+def make_bandpass_sos(low_hz, high_hz, fs, order=5):
+    return _bandpass_sos(low_hz, high_hz, fs, order).copy()
+
+def make_bandpass_zi(low_hz, high_hz, fs, order=5):
+    return _bandpass_zi(low_hz, high_hz, fs, order).copy()
+
+@njit(cache=True, fastmath=True)
+def sos_apply(sos, x, zi, out):
+    # Cascade of biquads in transposed direct form II, the same recursion as
+    # scipy.signal.sosfilt. zi is updated in place so blocks chain together.
+    for n in range(x.shape[0]):
+        v = x[n]
+        for k in range(sos.shape[0]):
+            y = sos[k, 0] * v + zi[k, 0]
+            zi[k, 0] = sos[k, 1] * v - sos[k, 4] * y + zi[k, 1]
+            zi[k, 1] = sos[k, 2] * v - sos[k, 5] * y
+            v = y
+        out[n] = v
 
-    x = np.cos(rad)
-    y = np.sin(rad)
-    ax.plot([0, x], [0, y], color="black", lw=3)
-    ax.plot(0, 0, "ko")
+# ============================================
+# Gauge view
+# ============================================
 
-    ax.text(0, -0.15, string_name, ha="center", va="center", fontsize=20, weight="bold")
-    ax.text(0, 0.9, f"{diff_cents:+.1f} cents", ha="center", fontsize=14)
-    fig.tight_layout()
+class GaugeView:
+    def __init__(self, fig):
+        self.fig = fig
+        self.canvas = fig.canvas
+
+        ax = fig.add_subplot(111)
+        ax.set_xlim(-1, 1)
+        ax.set_ylim(-0.3, 1.1)
+        ax.axis("off")
+        self.ax = ax
+
+        base = Wedge((0, 0), 1, 0, 180, color="lightgray", ec="k")
+        ax.add_patch(base)
+
+        zone_ok = Wedge((0, 0), 1, 80, 100, color="lightgreen")
+        zone_low = Wedge((0, 0), 1, 100, 180, color="#ff7f7f")
+        zone_hi = Wedge((0, 0), 1, 0, 80, color="#ff7f7f")
+        for z in [zone_ok, zone_low, zone_hi]:
+            ax.add_patch(z)
+
+        # Animated artists are left out of canvas.draw() and blitted on update
+        self._needle, = ax.plot([0, 0], [0, 1], color="black", lw=3, animated=True)
+        hub, = ax.plot(0, 0, "ko", animated=True)
+        self._name_text = ax.text(0, -0.15, "", ha="center", va="center",
+                                  fontsize=20, weight="bold", animated=True)
+        self._cents_text = ax.text(0, 0.9, "", ha="center", fontsize=14, animated=True)
+        self._artists = [self._needle, hub, self._name_text, self._cents_text]
+        fig.tight_layout()
+
+        # The wedges never change: keep the pixels of every full draw (the
+        # first one, and any resize) and only blit the axes box afterwards
+        self._bg = None
+        self.canvas.mpl_connect("draw_event", self._cache_bg)
+        self.canvas.draw_idle()
+
+    def _cache_bg(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self._artists:
+            self.ax.draw_artist(artist)
+
+    def update(self, diff_cents, string_name):
+        lim = np.clip(diff_cents, -50, 50)
+        theta = 90 - (lim / 50) * 90
+        rad = np.deg2rad(theta)
+
+        x = np.cos(rad)
+        y = np.sin(rad)
+        self._needle.set_data([0, x], [0, y])
+        self._name_text.set_text(string_name)
+        self._cents_text.set_text(f"{diff_cents:+.1f} cents")
+
+        if self._bg is None:
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_artists()
+        self.canvas.blit(self.ax.bbox)
 
 # ============================================
 # Autocorrelation detection
 # ============================================
 
-def detect_frequency_autocorr(x, fs):
-    x = x - np.mean(x)
-    corr = np.correlate(x, x, mode='full')
-    corr = corr[len(corr)//2:]
-    d = np.diff(corr)
-    start = np.where(d > 0)[0][0]
-    peak = np.argmax(corr[start:]) + start
+# The bandpass keeps nothing above 400 Hz, so the pitch detector can work
+# at fs/16 (~2.7 kHz) without aliasing
+DECIMATION = 16
+
+def autocorr_nfft(n):
+    # FFT length >= 2n-1, so the circular autocorrelation is linear
+    return next_fast_len(2 * n - 1, real=True)
+
+@njit(cache=True, fastmath=True)
+def _ac_peak(corr, lag_min, lag_max):
+    lag_max = min(lag_max, corr.shape[0])
+    prev = corr[lag_min]
+    best = 0.0
+    peak = 0
+    rising = False
+    for lag in range(lag_min + 1, lag_max):
+        c = corr[lag]
+        if not rising and c > prev:
+            rising = True
+        if rising and c > best:
+            best = c
+            peak = lag
+        prev = c
+    return peak
+
+def detect_frequency_autocorr(x, fs, fmin=40.0, fmax=400.0):
+    # Wiener-Khinchin: the autocorrelation is the inverse FFT of |X|^2
+    N = len(x)
+    nfft = autocorr_nfft(N)
+    X = rfft(x - np.mean(x), nfft, workers=-1)
+    corr = irfft(X.real**2 + X.imag**2, nfft, workers=-1)[:N]
+
+    lag_min = max(int(fs / fmax), 1)
+    lag_max = int(fs / fmin) + 1
+    if lag_max - lag_min < 2 or lag_min >= N:
+        return 0
+    peak = _ac_peak(corr, lag_min, lag_max)
     if peak == 0:
         return 0
-    return fs / peak
+
+    # Parabola through the peak and its neighbours for a sub-sample lag
+    delta = 0.0
+    if peak + 1 < N:
+        y0, y1, y2 = corr[peak - 1], corr[peak], corr[peak + 1]
+        denom = y0 - 2 * y1 + y2
+        if denom != 0:
+            delta = 0.5 * (y0 - y2) / denom
+    return fs / (peak + delta)
 
 # ============================================
 # Live tuner class
 # ============================================
 
 class LiveTuner:
-    def __init__(self, fig_gauge, canvas_gauge, fig_spectrum, canvas_spectrum,
+    def __init__(self, root, status_text, fig_gauge, fig_spectrum, canvas_spectrum,
                  selected_device_name, device_dict, fs=44100, block_duration=0.06):
 
+        self.root = root
+        self.status_text = status_text
         self.fs = fs
-        self.block_duration = block_duration
-        self.blocksize = int(self.fs * self.block_duration)
-        self.q = queue.Queue()
+        # Only the newest block matters: older ones are dropped on append
+        self.q = deque(maxlen=1)
+        self._new_block = threading.Event()
+        self._worker = None
+        self._result = None
         self.stream = None
         self.running = False
+        self._next_tick = None
+        self.set_block_duration(block_duration)
 
         self.fig_gauge = fig_gauge
-        self.canvas_gauge = canvas_gauge
         self.fig_spectrum = fig_spectrum
         self.canvas_spectrum = canvas_spectrum
 
+        self.gauge = GaugeView(fig_gauge)
+
+        # Same as the gauge: the axes are drawn once and cached, only the
+        # spectrum line is redrawn on each update
+        ax = self.fig_spectrum.add_subplot(111)
+        ax.set_xlim(0, 1500)
+        ax.set_ylim(0, 1.1)
+        ax.set_xlabel("Frequency (Hz)")
+        ax.set_ylabel("Amplitude (normalized)")
+        self._ax_spec = ax
+        self._spec_line, = ax.plot([], [], color="blue", animated=True)
+        self.fig_spectrum.tight_layout()
+        self._spec_bg = None
+        self.canvas_spectrum.mpl_connect("draw_event", self._cache_spec_bg)
+        self.canvas_spectrum.draw_idle()
+
         self.selected_device_name = selected_device_name
         self.device_dict = device_dict
 
@@ -123,31 +255,71 @@ class LiveTuner:
         self.note_counter = 0
         self.note_confirm_threshold = 5
 
-        self.sos = make_bandpass_sos(40, 400, fs)
-        self.zi = sosfilt_zi(self.sos)
+        # The microphone delivers float32, so the whole filter runs in float32
+        self.sos = make_bandpass_sos(40, 400, fs).astype(np.float32)
+        self._zi0 = make_bandpass_zi(40, 400, fs).astype(np.float32)
+        self.zi = self._zi0.copy()
+        self._zi_primed = False
+
+        self.freq_history = deque(maxlen=5)
 
-        self.freq_history = []
+        # Compile the filter and the pitch detector now rather than on the
+        # first block
+        sos_apply(self.sos, np.zeros(1, dtype=np.float32), self._zi0.copy(),
+                  np.empty(1, dtype=np.float32))
+        detect_frequency_autocorr(np.zeros(self.blocksize // DECIMATION, dtype=np.float32),
+                                  self.fs / DECIMATION)
+
+    def set_block_duration(self, block_duration):
+        # The stream and the DSP thread use the block size, restart them
+        restart = self.running
+        if restart:
+            self.stop()
+
+        self.block_duration = block_duration
+        self.blocksize = int(self.fs * self.block_duration)
+
+        # The FFT length and its frequency axis only depend on the block size
+        self.nfft = next_fast_len(self.blocksize, real=True)
+        self.fft_freqs = rfftfreq(self.nfft, 1/self.fs)
+        self._spec_bins = np.searchsorted(self.fft_freqs, 1500) + 1
+
+        # Scratch buffers reused for every block
+        self._arr_buf = np.empty(self.blocksize, dtype=np.float32)
+        self._abs_buf = np.empty(self.blocksize, dtype=np.float32)
+        self._filt_buf = np.empty(self.blocksize, dtype=np.float32)
+
+        if restart:
+            self.start()
 
     def audio_callback(self, indata, frames, time, status):
         if not status:
-            self.q.put(indata.copy())
+            self.q.append(indata.copy())
+            self._new_block.set()
 
     def start(self):
         if self.running:
             return
         try:
-            device_idx = self.device_dict[self.selected_device_name.get()]
-            self.stream = sd.InputStream(
-                device=device_idx,
-                channels=1,
-                samplerate=self.fs,
-                blocksize=self.blocksize,
-                callback=self.audio_callback
-            )
-            self.stream.start()
+            self._open_stream()
             self.running = True
         except Exception as e:
             print("Audio error:", e)
+            return
+
+        self._worker = threading.Thread(target=self._dsp_loop, daemon=True)
+        self._worker.start()
+
+    def _open_stream(self):
+        device_idx = self.device_dict[self.selected_device_name.get()]
+        self.stream = sd.InputStream(
+            device=device_idx,
+            channels=1,
+            samplerate=self.fs,
+            blocksize=self.blocksize,
+            callback=self.audio_callback
+        )
+        self.stream.start()
 
     def stop(self):
         if not self.running:
@@ -158,170 +330,227 @@ class LiveTuner:
         except:
             pass
         self.running = False
-        with self.q.mutex:
-            self.q.queue.clear()
-        self.zi = sosfilt_zi(self.sos)
-        self.freq_history = []
+        self._worker.join(timeout=1.0)
+        self._worker = None
+        self.q.clear()
+        self._result = None
+        self._zi_primed = False
+        self.freq_history.clear()
+
+    def _periodic(self):
+        if not self.running:
+            self._next_tick = None
+            return
 
-    def poll(self):
-        last = None
-        while not self.q.empty():
-            last = self.q.get()
+        # Ticks follow a fixed deadline rather than the end of the previous
+        # poll, so processing time does not stretch the period
+        period = self.block_duration / 2
+        now = perf_counter()
+        if self._next_tick is None or now - self._next_tick > period:
+            self._next_tick = now
+        self._next_tick += period
+        self.root.after(max(1, int((self._next_tick - now) * 1000)), self._periodic)
+
+        self.poll()
+
+    def _cache_spec_bg(self, event):
+        self._spec_bg = self.canvas_spectrum.copy_from_bbox(self._ax_spec.bbox)
+        self._ax_spec.draw_artist(self._spec_line)
+
+    def _dsp_loop(self):
+        # Runs on its own thread: filtering, FFT and pitch detection release
+        # the GIL, so they overlap with the Tk drawing in poll
+        while self.running:
+            if not self._new_block.wait(timeout=0.1):
+                continue
+            self._new_block.clear()
+            try:
+                last = self.q.pop()
+            except IndexError:
+                continue
 
-        if last is not None:
-            arr = np.squeeze(last)
-            peak = np.max(np.abs(arr))
+            arr = self._arr_buf
+            np.copyto(arr, last[:, 0])
+            np.abs(arr, out=self._abs_buf)
+            peak = self._abs_buf.max()
 
             if peak < 0.02:
-                if self.running:
-                    root.after(int(self.block_duration*500), self.poll)
-                return
+                continue
 
-            arr = arr / peak
-            arr *= 2.0
+            # Normalize and boost in a single in-place multiply
+            np.multiply(arr, 2.0 / peak, out=arr)
 
-            try:
-                filtered, zf = sosfilt(self.sos, arr, zi=self.zi * arr[0])
-            except:
-                filtered = sosfilt(self.sos, arr)
-                zf = sosfilt_zi(self.sos) * filtered[-1]
-            self.zi = zf
-
-            N = len(filtered)
-            fft_vals = np.abs(np.fft.rfft(filtered))
-            fft_freqs = np.fft.rfftfreq(N, 1/self.fs)
-
-            ax = self.fig_spectrum.axes[0]
-            ax.clear()
-            ax.plot(fft_freqs, fft_vals, color="blue")
-            ax.set_xlim(0, 1500)
-            ax.set_ylim(0, np.max(fft_vals)*1.1)
-            ax.set_xlabel("Frequency (Hz)")
-            ax.set_ylabel("Amplitude")
-            self.fig_spectrum.tight_layout()
-            self.canvas_spectrum.draw()
-
-            freq = detect_frequency_autocorr(filtered, self.fs)
-
-            if freq > 0:
-                self.freq_history.append(freq)
-                self.freq_history = [f for f in self.freq_history if f > 0]
-                if len(self.freq_history) > 5:
-                    self.freq_history.pop(0)
-                freq_smooth = np.mean(self.freq_history)
-            else:
-                freq_smooth = 0
-
-            string, target = freq_to_string(freq_smooth)
-
-            if string == self.last_note:
-                self.note_counter += 1
-            else:
-                self.note_counter = 1
-                self.last_note = string
-
-            if self.note_counter >= self.note_confirm_threshold:
-                diff = cents_diff(freq_smooth, target) if freq_smooth > 0 else 0
-                status_text.set(f"{string} : {freq_smooth:.2f} Hz ({diff:+.1f} c)")
-                draw_gauge(self.fig_gauge, diff, string)
-                self.canvas_gauge.draw()
+            # The state is started at steady state for the first sample,
+            # then simply carried over from block to block
+            if not self._zi_primed:
+                np.multiply(self._zi0, arr[0], out=self.zi)
+                self._zi_primed = True
+            filtered = self._filt_buf
+            sos_apply(self.sos, arr, self.zi, filtered)
 
-        if self.running:
-            root.after(int(self.block_duration*500), self.poll)
+            fft_vals = np.abs(rfft(filtered, self.nfft, workers=-1))
+
+            freq = detect_frequency_autocorr(filtered[::DECIMATION],
+                                             self.fs / DECIMATION)
+
+            spec = fft_vals[:self._spec_bins]
+            spec_max = spec.max()
+            if spec_max > 0:
+                spec /= spec_max
+
+            # A single attribute store, read by poll on the Tk thread
+            self._result = (self.fft_freqs[:self._spec_bins], spec, freq)
+
+    def poll(self):
+        result = self._result
+        if result is None:
+            return
+        self._result = None
+        fft_freqs, spec, freq = result
+
+        self._spec_line.set_data(fft_freqs, spec)
+        if self._spec_bg is not None:
+            self.canvas_spectrum.restore_region(self._spec_bg)
+            self._ax_spec.draw_artist(self._spec_line)
+            self.canvas_spectrum.blit(self._ax_spec.bbox)
+
+        if freq > 0:
+            self.freq_history.append(freq)
+            freq_smooth = sum(self.freq_history) / len(self.freq_history)
+        else:
+            freq_smooth = 0
+
+        string, target = freq_to_string(freq_smooth)
+
+        if string == self.last_note:
+            self.note_counter += 1
+        else:
+            self.note_counter = 1
+            self.last_note = string
+
+        if self.note_counter >= self.note_confirm_threshold:
+            diff = cents_diff(freq_smooth, target) if freq_smooth > 0 else 0
+            self.status_text.set(f"{string} : {freq_smooth:.2f} Hz ({diff:+.1f} c)")
+            self.gauge.update(diff, string)
 
 # ============================================
 # Tkinter GUI
 # ============================================
 
-root = tk.Tk()
-root.title("Guitar tuner + Spectrum")
+def main():
+    root = tk.Tk()
+    root.title("Guitar tuner + Spectrum")
 
-title_label = tk.Label(root, text="L'Accordeur-inator 3000", font=("Helvetica", 28, "bold"))
-title_label.pack(pady=15)
+    title_label = tk.Label(root, text="L'Accordeur-inator 3000", font=("Helvetica", 28, "bold"))
+    title_label.pack(pady=15)
 
-fig_gauge = plt.Figure(figsize=(6,3))
-canvas_gauge = FigureCanvasTkAgg(fig_gauge, master=root)
-canvas_gauge.get_tk_widget().pack()
+    fig_gauge = plt.Figure(figsize=(6,3))
+    canvas_gauge = FigureCanvasTkAgg(fig_gauge, master=root)
+    canvas_gauge.get_tk_widget().pack()
 
-fig_spectrum = plt.Figure(figsize=(6,2))
-ax_spec = fig_spectrum.add_subplot(111)
-canvas_spectrum = FigureCanvasTkAgg(fig_spectrum, master=root)
-canvas_spectrum.get_tk_widget().pack()
+    fig_spectrum = plt.Figure(figsize=(6,2))
+    canvas_spectrum = FigureCanvasTkAgg(fig_spectrum, master=root)
+    canvas_spectrum.get_tk_widget().pack()
 
-status_text = tk.StringVar()
-status_text.set("No signal")
-tk.Label(root, textvariable=status_text).pack()
+    status_text = tk.StringVar()
+    status_text.set("No signal")
+    tk.Label(root, textvariable=status_text).pack()
 
-frame_btn = tk.Frame(root)
-frame_btn.pack(pady=6)
+    frame_btn = tk.Frame(root)
+    frame_btn.pack(pady=6)
 
-input_devices = [d for d in sd.query_devices() if d['max_input_channels'] > 0]
-device_dict = {}
-device_names_unique = []
+    # Filled in by populate_devices once the devices are enumerated
+    device_dict = {}
 
-for d in input_devices:
-    name = d['name']
-    if "primary" in name.lower() or "sound mapper" in name.lower():
-        continue
-    if name not in device_dict:
-        device_dict[name] = d['index']
-        device_names_unique.append(name)
+    selected_device_name = tk.StringVar()
+    selected_device_name.set("Searching...")
 
-selected_device_name = tk.StringVar()
-selected_device_name.set(device_names_unique[0] if device_names_unique else "No input")
+    tk.Label(frame_btn, text="Select mic:").grid(row=0, column=0)
+    device_menu = tk.OptionMenu(frame_btn, selected_device_name, "Searching...")
+    device_menu.grid(row=0, column=1, padx=6)
 
-tk.Label(frame_btn, text="Select mic:").grid(row=0, column=0)
-device_menu = tk.OptionMenu(frame_btn, selected_device_name, *device_names_unique)
-device_menu.grid(row=0, column=1, padx=6)
+    def populate_devices(devices):
+        menu = device_menu["menu"]
+        menu.delete(0, "end")
 
-# Block duration field
-tk.Label(frame_btn, text="Block duration (s):").grid(row=1, column=0)
-entry_block = tk.Entry(frame_btn)
-entry_block.insert(0, "0.06")
-entry_block.grid(row=1, column=1, padx=6)
+        for d in devices:
+            if d['max_input_channels'] <= 0:
+                continue
+            name = d['name']
+            if "primary" in name.lower() or "sound mapper" in name.lower():
+                continue
+            if name not in device_dict:
+                device_dict[name] = d['index']
+                menu.add_command(label=name, command=tk._setit(selected_device_name, name))
 
-# Threshold field
-tk.Label(frame_btn, text="Note threshold:").grid(row=2, column=0)
-entry_threshold = tk.Entry(frame_btn)
-entry_threshold.insert(0, "5")
-entry_threshold.grid(row=2, column=1, padx=6)
+        selected_device_name.set(next(iter(device_dict), "No input"))
 
-def apply_settings():
-    try:
-        new_block = float(entry_block.get())
-        new_thresh = int(entry_threshold.get())
+    # Block duration field
+    tk.Label(frame_btn, text="Block duration (s):").grid(row=1, column=0)
+    entry_block = tk.Entry(frame_btn)
+    entry_block.insert(0, "0.06")
+    entry_block.grid(row=1, column=1, padx=6)
 
-        live_tuner.block_duration = new_block
-        live_tuner.blocksize = int(live_tuner.fs * new_block)
-        live_tuner.note_confirm_threshold = new_thresh
+    # Threshold field
+    tk.Label(frame_btn, text="Note threshold:").grid(row=2, column=0)
+    entry_threshold = tk.Entry(frame_btn)
+    entry_threshold.insert(0, "5")
+    entry_threshold.grid(row=2, column=1, padx=6)
 
-        status_text.set(f"Updated settings")
-    except:
-        status_text.set("Invalid values")
+    def apply_settings():
+        try:
+            new_block = float(entry_block.get())
+            new_thresh = int(entry_threshold.get())
+
+            live_tuner.set_block_duration(new_block)
+            live_tuner.note_confirm_threshold = new_thresh
+
+            status_text.set(f"Updated settings")
+        except:
+            status_text.set("Invalid values")
 
-btn_apply = tk.Button(frame_btn, text="Apply", command=apply_settings)
-btn_apply.grid(row=3, column=0, columnspan=2, pady=5)
+    btn_apply = tk.Button(frame_btn, text="Apply", command=apply_settings)
+    btn_apply.grid(row=3, column=0, columnspan=2, pady=5)
 
-live_tuner = LiveTuner(fig_gauge, canvas_gauge, fig_spectrum, canvas_spectrum,
-                       selected_device_name, device_dict)
+    live_tuner = LiveTuner(root, status_text, fig_gauge, fig_spectrum, canvas_spectrum,
+                           selected_device_name, device_dict)
 
-def toggle():
-    if live_tuner.running:
+    def toggle():
+        if live_tuner.running:
+            live_tuner.stop()
+            btn_live.config(text="Start mic")
+            status_text.set("Mic stopped")
+        else:
+            live_tuner.start()
+            btn_live.config(text="Stop mic")
+            root.after(1, live_tuner._periodic)
+
+    btn_live = tk.Button(frame_btn, text="Start mic", command=toggle)
+    btn_live.grid(row=4, column=0, columnspan=2, pady=6)
+
+    def on_close():
         live_tuner.stop()
-        btn_live.config(text="Start mic")
-        status_text.set("Mic stopped")
-    else:
-        live_tuner.start()
-        btn_live.config(text="Stop mic")
-        root.after(1, live_tuner.poll)
+        root.destroy()
 
-btn_live = tk.Button(frame_btn, text="Start mic", command=toggle)
-btn_live.grid(row=4, column=0, columnspan=2, pady=6)
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    def device_error(e):
+        selected_device_name.set("No input")
+        status_text.set(f"Audio device error: {e}")
+
+    def query_devices():
+        try:
+            devices = sd.query_devices()
+        except Exception as e:
+            print("Audio error:", e)
+            root.after(0, device_error, e)
+            return
+        root.after(0, populate_devices, devices)
 
-def on_close():
-    live_tuner.stop()
-    root.destroy()
+    # Enumerating the host APIs can take a while, do it after the window is up
+    threading.Thread(target=query_devices, daemon=True).start()
 
-root.protocol("WM_DELETE_WINDOW", on_close)
-root.mainloop()
+    root.mainloop()
 
+if __name__ == "__main__":
+    main()